@@ -1,14 +1,14 @@
 import bettercam
 import numpy as np
-import time
 import threading
-import hashlib
 import argparse
 import tkinter as tk
 import ctypes
 import json
-import os
+import functools
+import types
 from seed_growth_core import grow_seeds
+from fast_diff import capture_pacing, fingerprint_shape, block_fingerprints, block_diff_count
 
 try:
     ctypes.windll.shcore.SetProcessDpiAwareness(2)
@@ -19,45 +19,6 @@ except:
         pass
 
 
-def get_block_hash(pixels):
-    """Get a hash of pixel data for a block"""
-    return hashlib.md5(pixels.tobytes()).hexdigest()
-
-
-def get_all_block_hashes(screen_pixels, block_size):
-    """Divide screen into blocks and get hash for each block"""
-    height, width = screen_pixels.shape[:2]
-    
-    block_hashes = {}
-    
-    for y in range(0, height, block_size):
-        for x in range(0, width, block_size):
-            block_y_end = min(y + block_size, height)
-            block_x_end = min(x + block_size, width)
-            
-            block_pixels = screen_pixels[y:block_y_end, x:block_x_end]
-            block_key = (y // block_size, x // block_size)
-            block_hashes[block_key] = get_block_hash(block_pixels)
-    
-    return block_hashes
-
-
-def calculate_change_percentage(previous_hashes, current_hashes):
-    """Calculate percentage of blocks that changed"""
-    if not previous_hashes:
-        return 0.0
-    
-    changed_count = 0
-    total_count = len(current_hashes)
-    
-    for block_key in current_hashes:
-        if block_key not in previous_hashes or previous_hashes[block_key] != current_hashes[block_key]:
-            changed_count += 1
-    
-    percentage = (changed_count / total_count) * 100 if total_count > 0 else 0
-    return percentage
-
-
 class AdaptiveBlockMonitor:
     def __init__(self, args):
         self.seeds = args.seeds
@@ -71,18 +32,30 @@ class AdaptiveBlockMonitor:
         self.block_size = args.block_size
         self.update_rate = args.update_rate
         self.change_threshold = args.change_threshold
+        self.change_tolerance = args.change_tolerance
         
         self.monitoring = True
+        # Cuts the monitor loop's sleep between reads short on stop
+        self._stop_event = threading.Event()
         self.tracked_rect = None
-        self.previous_hashes = None
+        self._watch_region = None
+        self._fingerprints = None  # [previous, current] pair, swapped every tick
+        self._fingerprint_idx = 0
         self.iteration = 0
         
         self.screen_width = 0
         self.screen_height = 0
         self.exclusion_center_width = 25
         self.exclusion_center_height = 33
+        self.exclusion_zone = None
         self.show_exclusion_zone = args.show_exclusion_zone
         
+        # Canvas items, created on the first redraw
+        self._track_item = None
+        self._excl_item = None
+        self._last_drawn = None
+        self._redraw_scheduled = False
+        
         # Create overlay window
         self.results_window = tk.Tk()
         self.results_window.attributes('-topmost', True)
@@ -102,15 +75,19 @@ class AdaptiveBlockMonitor:
     def run(self):
         try:
             camera = bettercam.create(output_color="BGR")
+            # Let bettercam pace capture and drop the frames we would not look at. video_mode repeats the
+            # last frame on an idle desktop, so frames keep arriving every update_rate seconds and the
+            # threshold always compares frames that far apart
+            capture_fps, read_interval = capture_pacing(self.update_rate)
+            camera.start(target_fps=capture_fps, video_mode=True)
             
             # Initial capture
-            screen_capture = camera.grab()
-            screen_pixels = np.array(screen_capture)
-            screen_pixels = screen_pixels[:, :, [2, 1, 0]]
+            screen_pixels = camera.get_latest_frame()
             
             screen_height, screen_width = screen_pixels.shape[:2]
             self.screen_width = screen_width
             self.screen_height = screen_height
+            self._recompute_exclusion()
             
             # Setup overlay window
             self.results_window.geometry(f"{screen_width}x{screen_height}+0+0")
@@ -123,9 +100,11 @@ class AdaptiveBlockMonitor:
             self._update_canvas(canvas)
             self.results_window.deiconify()
             
-            self.previous_hashes = get_all_block_hashes(screen_pixels, self.block_size)
+            fingerprints_shape = fingerprint_shape(screen_height, screen_width, self.block_size)
+            self._fingerprints = [np.empty(fingerprints_shape, dtype=np.uint8), np.empty(fingerprints_shape, dtype=np.uint8)]
+            self._reset_fingerprints(screen_pixels)
             
-            monitor_thread = threading.Thread(target=self._monitor_loop, args=(camera, canvas), daemon=True)
+            monitor_thread = threading.Thread(target=self._monitor_loop, args=(camera, canvas, read_interval), daemon=True)
             monitor_thread.start()
             
             self.results_window.mainloop()
@@ -134,54 +113,82 @@ class AdaptiveBlockMonitor:
             print(f"Error: {e}")
         finally:
             self.monitoring = False
+            self._stop_event.set()
+            camera.stop()
             camera.release()
     
-    def _monitor_loop(self, camera, canvas):
+    def _monitor_loop(self, camera, canvas, read_interval):
         try:
             while self.monitoring:
-                time.sleep(self.update_rate)
+                if read_interval and self._stop_event.wait(read_interval):
+                    break
+                # Blocks until the capture thread has a new frame
+                frame = camera.get_latest_frame()
                 self.iteration += 1
-                
-                screen_capture = camera.grab()
-                if screen_capture is None:
+                if not isinstance(frame, np.ndarray) or frame.ndim != 3 or frame.shape[-1] != 3:
                     continue
                 
-                try:
-                    screen_pixels = np.array(screen_capture)
-                    if screen_pixels.ndim < 3:
-                        continue
-                    screen_pixels = screen_pixels[:, :, [2, 1, 0]]
-                except (IndexError, ValueError):
-                    continue
+                # Only the area around the tracked rectangle needs watching
+                region = self._watch_region
+                if region is not None:
+                    screen_pixels = frame[region[1]:region[3], region[0]:region[2]]
+                else:
+                    screen_pixels = frame
                 
-                current_hashes = get_all_block_hashes(screen_pixels, self.block_size)
-                change_percentage = calculate_change_percentage(self.previous_hashes, current_hashes)
+                # Region corners sit on the block grid, so its blocks map straight into the full-screen arrays
+                region_x1, region_y1 = (region[0], region[1]) if region is not None else (0, 0)
+                block_x1 = region_x1 // self.block_size
+                block_y1 = region_y1 // self.block_size
+                block_y2 = block_y1 - (-screen_pixels.shape[0] // self.block_size)
+                block_x2 = block_x1 - (-screen_pixels.shape[1] // self.block_size)
+                previous_fingerprints = self._fingerprints[self._fingerprint_idx][block_y1:block_y2, block_x1:block_x2]
+                current_fingerprints = self._fingerprints[1 - self._fingerprint_idx][block_y1:block_y2, block_x1:block_x2]
                 
-                print(f"[{self.iteration:03d}] {change_percentage:5.1f}% blocks changed")
+                # The kernel stops counting once the threshold is certain to be exceeded
+                total_blocks = current_fingerprints.shape[0] * current_fingerprints.shape[1]
+                change_limit = int(self.change_threshold / 100 * total_blocks)
+                changed_blocks = block_diff_count(
+                    screen_pixels, previous_fingerprints, current_fingerprints,
+                    self.block_size, self.pixel_sample_rate, self.change_tolerance, change_limit
+                )
+                change_percentage = changed_blocks / total_blocks * 100
+                threshold_exceeded = changed_blocks > change_limit
                 
-                if change_percentage > self.change_threshold:
+                print(f"[{self.iteration:03d}] {change_percentage:5.1f}%{'+' if threshold_exceeded else ''} blocks changed")
+                
+                if threshold_exceeded:
                     print(f"  → Threshold exceeded ({self.change_threshold}%), searching for new rectangle")
-                    self._search_and_update(screen_pixels)
+                    self._search_and_update(frame)
+                    self._reset_fingerprints(frame)
+                else:
+                    self._fingerprint_idx ^= 1
                 
-                self.results_window.after(0, lambda: self._update_canvas(canvas))
-                self.previous_hashes = current_hashes
+                if self.tracked_rect != self._last_drawn:
+                    self._schedule_redraw(canvas)
         
         except Exception as e:
             print(f"Monitor error: {e}")
     
+    def _recompute_exclusion(self):
+        """Cache the exclusion zone; call again whenever the screen size or exclusion_center_* change"""
+        exclude_width = int(self.screen_width * self.exclusion_center_width / 100)
+        exclude_height = int(self.screen_height * self.exclusion_center_height / 100)
+        
+        exclude_x1 = (self.screen_width - exclude_width) // 2
+        exclude_y1 = (self.screen_height - exclude_height) // 2
+        exclude_x2 = exclude_x1 + exclude_width
+        exclude_y2 = exclude_y1 + exclude_height
+        
+        self.exclusion_zone = (exclude_x1, exclude_y1, exclude_x2, exclude_y2)
+    
+    def _reset_fingerprints(self, screen_pixels):
+        """Fingerprint a full frame into both buffers so blocks outside the watch region agree"""
+        previous_fingerprints = self._fingerprints[self._fingerprint_idx]
+        block_fingerprints(screen_pixels, self.block_size, self.pixel_sample_rate, previous_fingerprints)
+        np.copyto(self._fingerprints[1 - self._fingerprint_idx], previous_fingerprints)
+    
     def _search_and_update(self, screen_pixels):
         try:
-            # Calculate exclusion zone coordinates
-            exclude_width = int(self.screen_width * self.exclusion_center_width / 100)
-            exclude_height = int(self.screen_height * self.exclusion_center_height / 100)
-            
-            exclude_x1 = (self.screen_width - exclude_width) // 2
-            exclude_y1 = (self.screen_height - exclude_height) // 2
-            exclude_x2 = exclude_x1 + exclude_width
-            exclude_y2 = exclude_y1 + exclude_height
-            
-            exclusion_zone = (exclude_x1, exclude_y1, exclude_x2, exclude_y2)
-            
             results = grow_seeds(
                 num_seeds=self.seeds,
                 num_keep=1,
@@ -193,50 +200,79 @@ class AdaptiveBlockMonitor:
                 growth_pixels=self.growth_pixels,
                 pixel_sample_rate=self.pixel_sample_rate,
                 no_overlap=self.no_overlap,
-                exclusion_zone=exclusion_zone
+                exclusion_zone=self.exclusion_zone
             )
             
             if results:
                 largest_coords, largest_area = results[0]
                 self.tracked_rect = largest_coords
+                self._update_watch_region()
                 print(f"  → Updated tracked rectangle: {largest_coords} ({largest_area} px²)")
         
         except Exception as e:
             print(f"Error searching: {e}")
     
-    def _update_canvas(self, canvas):
-        canvas.delete("all")
+    def _update_watch_region(self):
+        """Expand the tracked rectangle by a few blocks and snap it to the block grid"""
+        margin = self.block_size * 4
+        x1, y1, x2, y2 = self.tracked_rect
         
-        # Draw exclusion zone (blue rectangle)
-        if self.show_exclusion_zone and self.screen_width > 0 and self.screen_height > 0:
-            exclude_width = int(self.screen_width * self.exclusion_center_width / 100)
-            exclude_height = int(self.screen_height * self.exclusion_center_height / 100)
-            
-            exclude_x1 = (self.screen_width - exclude_width) // 2
-            exclude_y1 = (self.screen_height - exclude_height) // 2
-            exclude_x2 = exclude_x1 + exclude_width
-            exclude_y2 = exclude_y1 + exclude_height
+        x1 = max(0, (x1 - margin) // self.block_size * self.block_size)
+        y1 = max(0, (y1 - margin) // self.block_size * self.block_size)
+        x2 = min(self.screen_width, -(-(x2 + margin) // self.block_size) * self.block_size)
+        y2 = min(self.screen_height, -(-(y2 + margin) // self.block_size) * self.block_size)
+        
+        self._watch_region = (x1, y1, x2, y2) if x2 > x1 and y2 > y1 else None
+    
+    def _schedule_redraw(self, canvas):
+        """Queue one canvas redraw for when Tk is idle, coalescing requests made meanwhile"""
+        if self._redraw_scheduled:
+            return
+        self._redraw_scheduled = True
+        self.results_window.after_idle(self._run_redraw, canvas)
+    
+    def _run_redraw(self, canvas):
+        self._redraw_scheduled = False
+        self._update_canvas(canvas)
+    
+    def _update_canvas(self, canvas):
+        # Items are created once and moved afterwards, so unchanged ticks cost nothing
+        if self._track_item is None:
+            # Draw exclusion zone (blue rectangle)
+            if self.show_exclusion_zone and self.exclusion_zone is not None:
+                self._excl_item = canvas.create_rectangle(*self.exclusion_zone, outline='blue', width=2, fill='')
             
-            canvas.create_rectangle(exclude_x1, exclude_y1, exclude_x2, exclude_y2, outline='blue', width=2, fill='')
+            # Draw tracked rectangle (red), hidden until there is something to track
+            self._track_item = canvas.create_rectangle(0, 0, 0, 0, outline='red', width=3, fill='', state='hidden')
+        elif self.tracked_rect == self._last_drawn:
+            return
         
-        # Draw tracked rectangle (red)
         if self.tracked_rect is not None:
-            x1, y1, x2, y2 = self.tracked_rect
-            canvas.create_rectangle(x1, y1, x2, y2, outline='red', width=3, fill='')
+            canvas.coords(self._track_item, *self.tracked_rect)
+            canvas.itemconfigure(self._track_item, state='normal')
+        else:
+            canvas.itemconfigure(self._track_item, state='hidden')
+        self._last_drawn = self.tracked_rect
         
-        self.results_window.update()
+        self.results_window.update_idletasks()
 
     def stop(self):
         self.monitoring = False
+        self._stop_event.set()
         self.results_window.destroy()
 
 
+@functools.lru_cache(maxsize=1)
 def load_config(config_path='config.json'):
-    """Load configuration from JSON file"""
-    if os.path.exists(config_path):
+    """Load configuration from JSON file, parsed once and returned read-only"""
+    try:
         with open(config_path, 'r') as f:
-            return json.load(f)
-    return {}
+            return types.MappingProxyType(json.load(f))
+    except FileNotFoundError:
+        return types.MappingProxyType({})
+    except json.JSONDecodeError as e:
+        print(f"Ignoring invalid config {config_path}: {e}")
+        return types.MappingProxyType({})
 
 
 def main():
@@ -256,6 +292,7 @@ def main():
     parser.add_argument('--block-size', type=int, default=config.get('block_size', 10), help='Block size for change detection')
     parser.add_argument('--update-rate', type=float, default=config.get('update_rate', 1), help='Update rate in seconds')
     parser.add_argument('--change-threshold', type=float, default=config.get('change_threshold', 50.0), help='Percentage of blocks that must change to trigger a search')
+    parser.add_argument('--change-tolerance', type=int, default=config.get('change_tolerance', 4), help='Per-channel color difference a block may drift before it counts as changed')
     parser.add_argument('--exclude-center-width', type=int, default=config.get('exclude_center_width', 25), help='Percentage of screen width for exclusion center')
     parser.add_argument('--exclude-center-height', type=int, default=config.get('exclude_center_height', 33), help='Percentage of screen height for exclusion center')
     parser.add_argument('--show-exclusion-zone', action='store_true', default=config.get('show_exclusion_zone', False), help='Show the blue exclusion zone rectangle')
@@ -0,0 +1,120 @@
+import numpy as np
+from numba import jit, prange, config
+
+# Block rows diffed between early-exit checks, a few per worker thread
+_CHUNK_ROWS = config.NUMBA_NUM_THREADS * 4
+# bettercam's own default capture rate, used when update_rate asks for no delay at all
+_MAX_CAPTURE_FPS = 60
+
+
+def capture_pacing(update_rate):
+    """Split an update interval in seconds into a bettercam capture rate and a sleep between reads
+
+    bettercam paces in whole frames per second, so intervals above a second sleep between reads;
+    0 means as fast as the display refreshes.
+    """
+    if update_rate <= 0:
+        return _MAX_CAPTURE_FPS, 0
+    if update_rate > 1:
+        return 1, update_rate
+    return min(_MAX_CAPTURE_FPS, max(1, round(1 / update_rate))), 0
+
+
+def fingerprint_shape(height, width, block_size):
+    """Shape of the per-block average color array for a screen of the given size"""
+    return (-(-height // block_size), -(-width // block_size), 3)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _block_average(pixels, y1, y2, x1, x2, sample_rate):
+    r_sum, g_sum, b_sum = 0, 0, 0
+    for y in range(y1, y2, sample_rate):
+        for x in range(x1, x2, sample_rate):
+            r_sum += pixels[y, x, 0]
+            g_sum += pixels[y, x, 1]
+            b_sum += pixels[y, x, 2]
+
+    count = ((y2 - y1 + sample_rate - 1) // sample_rate) * ((x2 - x1 + sample_rate - 1) // sample_rate)
+    return r_sum // count, g_sum // count, b_sum // count
+
+
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def block_fingerprints(pixels, block_size, sample_rate, out):
+    """Write the average color of every block into out, reading every sample_rate-th pixel"""
+    height, width = pixels.shape[0], pixels.shape[1]
+
+    for by in prange(out.shape[0]):
+        y1 = by * block_size
+        y2 = min(y1 + block_size, height)
+        for bx in range(out.shape[1]):
+            x1 = bx * block_size
+            x2 = min(x1 + block_size, width)
+            r, g, b = _block_average(pixels, y1, y2, x1, x2, sample_rate)
+            out[by, bx, 0] = r
+            out[by, bx, 1] = g
+            out[by, bx, 2] = b
+
+
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def block_diff_count(pixels, previous, out, block_size, sample_rate, tolerance, limit):
+    """Fingerprint pixels into out and count blocks that drifted from previous by more than tolerance
+
+    Counting stops once more than limit blocks have changed, leaving the rest of out unwritten.
+    """
+    height, width = pixels.shape[0], pixels.shape[1]
+    blocks_y = out.shape[0]
+
+    changed = 0
+    for chunk_start in range(0, blocks_y, _CHUNK_ROWS):
+        for by in prange(chunk_start, min(chunk_start + _CHUNK_ROWS, blocks_y)):
+            y1 = by * block_size
+            y2 = min(y1 + block_size, height)
+            for bx in range(out.shape[1]):
+                x1 = bx * block_size
+                x2 = min(x1 + block_size, width)
+                r, g, b = _block_average(pixels, y1, y2, x1, x2, sample_rate)
+                out[by, bx, 0] = r
+                out[by, bx, 1] = g
+                out[by, bx, 2] = b
+
+                if (abs(r - np.int64(previous[by, bx, 0])) > tolerance or
+                    abs(g - np.int64(previous[by, bx, 1])) > tolerance or
+                    abs(b - np.int64(previous[by, bx, 2])) > tolerance):
+                    changed += 1
+
+        if changed > limit:
+            break
+
+    return changed
+
+
+@jit(nopython=True, nogil=True, parallel=True, cache=True)
+def tile_changed_mask(current, previous, row_starts, col_starts):
+    """Flag every tile that has any differing pixel, for tiles starting at the given rows and columns
+
+    Both frames must be C-contiguous.
+    """
+    height, width, channels = current.shape
+    current_rows = current.reshape(height, width * channels)
+    previous_rows = previous.reshape(height, width * channels)
+    out = np.zeros((row_starts.shape[0], col_starts.shape[0]), dtype=np.bool_)
+
+    for ty in prange(row_starts.shape[0]):
+        y1 = row_starts[ty]
+        y2 = row_starts[ty + 1] if ty + 1 < row_starts.shape[0] else height
+        for tx in range(col_starts.shape[0]):
+            x1 = col_starts[tx] * channels
+            x2 = col_starts[tx + 1] * channels if tx + 1 < col_starts.shape[0] else width * channels
+
+            # Most tiles are unchanged, so stop scanning a tile at its first differing row
+            for y in range(y1, y2):
+                current_row = current_rows[y, x1:x2]
+                previous_row = previous_rows[y, x1:x2]
+                differs = np.uint8(0)
+                for x in range(current_row.shape[0]):
+                    differs |= current_row[x] ^ previous_row[x]
+                if differs:
+                    out[ty, tx] = True
+                    break
+
+    return out
@@ -1,34 +1,143 @@
 import sys
 import json
 import os
-from pathlib import Path
-import shutil
 import random
 import threading
-import hashlib
-import time
+import re
+import functools
 import numpy as np
 import bettercam
 from seed_growth_core import grow_seeds
+from fast_diff import capture_pacing, tile_changed_mask
 
 # Suppress Qt DPI warnings on Windows and configure WebEngine
 os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = ""
 os.environ["QT_DEBUG_PLUGINS"] = "0"
+# One renderer process and no translate/cast/crash-report/background services are enough for a single
+# PIP page. GPU stays enabled for hardware video decoding
+os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", " ".join([
+    "--disable-features=Translate,TranslateUI,MediaRouter",
+    "--renderer-process-limit=1",
+    "--disable-background-networking",
+    "--disable-breakpad",
+]))
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QApplication, QProgressBar, QDialog, QLabel, QMessageBox
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QApplication, QProgressBar, QDialog, QLabel, QMessageBox, QFrame
 )
 import tkinter as tk
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage, QWebEngineSettings
-from PyQt6.QtCore import Qt, QTimer, QRect, QPoint, QSize, QUrl, pyqtSignal, QObject
+from PyQt6.QtCore import Qt, QTimer, QRect, QPoint, QSize, QUrl, pyqtSignal, QObject, QSettings
 from PyQt6.QtGui import QIcon, QKeySequence
 from PyQt6.QtCore import pyqtSlot
 from PyQt6.QtGui import QPainterPath, QRegion, QPixmap, QPainter, QPen, QColor
 
+# Address bar input that is navigated to directly rather than searched for
+_URL_RE = re.compile(r'^(https?://|localhost|[\w\-]+\.[\w\-]+)', re.I)
+_DEFAULT_URL = "https://youtube.com/"
+# Browser disk cache cap when config.json does not set a valid http_cache_mb
+_DEFAULT_HTTP_CACHE_MB = 32
 
+# Per-user browser data, resolved once at import
+APP_DIR = os.path.join(os.path.expanduser("~"), ".pip_video_browser")
+CACHE_DIR = os.path.join(APP_DIR, "cache")
+STORAGE_DIR = os.path.join(APP_DIR, "web_data")
+
+
+# Application-wide stylesheet, parsed once in main(); rules are scoped to the window or dialog they style
+_APP_QSS = """
+    PIPVideoBrowser QWidget {
+        border-radius: 12px;
+    }
+    PIPVideoBrowser QPushButton#maximizeBtn, PIPVideoBrowser CtrlButton {
+        background-color: rgba(0, 0, 0, 0.7);
+        color: white;
+        border: none;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    PIPVideoBrowser CtrlButton {
+        padding: 5px;
+    }
+    PIPVideoBrowser QPushButton#maximizeBtn:hover, PIPVideoBrowser CtrlButton:hover {
+        background-color: rgba(100, 150, 255, 0.15);
+    }
+    PIPVideoBrowser QPushButton#maximizeBtn:pressed, PIPVideoBrowser CtrlButton:pressed {
+        background-color: rgba(80, 120, 200, 0.25);
+    }
+    PIPVideoBrowser QLineEdit#urlBar {
+        border-radius: 8px;
+        padding: 5px;
+        background-color: rgba(0, 0, 0, 0.7);
+        color: white;
+        border: none;
+    }
+    PIPVideoBrowser QLineEdit#urlBar:hover {
+        background-color: rgba(100, 150, 255, 0.15);
+    }
+    PIPVideoBrowser QLineEdit#urlBar:focus {
+        background-color: rgba(80, 120, 200, 0.25);
+    }
+    PIPVideoBrowser QProgressBar {
+        border: none;
+        background-color: transparent;
+        margin: 0px;
+        padding: 0px;
+    }
+    PIPVideoBrowser QProgressBar::chunk {
+        background-color: rgba(100, 150, 255, 0.9);
+    }
+
+    ConfigDialog, ConfigDialog QDialog {
+        background-color: #1e1e2e;
+        border-radius: 8px;
+    }
+    ConfigDialog QLabel {
+        color: #cdd6f4;
+        font-family: 'Segoe UI', Arial;
+        font-size: 13px;
+    }
+    ConfigDialog QLabel#title {
+        font-size: 16px;
+        font-weight: bold;
+        color: #89b4fa;
+    }
+    ConfigDialog QFrame#divider {
+        background-color: #45475a;
+        border: none;
+        max-height: 1px;
+        margin: 5px 0px;
+    }
+    ConfigDialog QLabel#cacheLabel {
+        color: #f38ba8;
+        font-weight: bold;
+    }
+    ConfigDialog QLabel#cookiesLabel {
+        color: #a6e3a1;
+        font-weight: bold;
+        margin-top: 8px;
+    }
+    ConfigDialog QPushButton#dialogBtn {
+        background-color: #313244;
+        color: #cdd6f4;
+        border: 1px solid #45475a;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-weight: 500;
+        font-family: 'Segoe UI', Arial;
+    }
+    ConfigDialog QPushButton#dialogBtn:hover {
+        background-color: #45475a;
+        border: 1px solid #6c7086;
+    }
+    ConfigDialog QPushButton#dialogBtn:pressed {
+        background-color: #585b70;
+    }
+"""
+
+
+@functools.lru_cache(maxsize=1)
 def create_app_icon():
-    """Create a simple blue hollow circle icon"""
+    """Create a simple blue hollow circle icon, shared by every window"""
     size = 64
     pixmap = QPixmap(size, size)
     pixmap.fill(Qt.GlobalColor.transparent)
@@ -46,43 +155,42 @@ def create_app_icon():
     return QIcon(pixmap)
 
 
-def get_block_hash(pixels):
-    """Get a hash of pixel data for a block"""
-    return hashlib.md5(pixels.tobytes()).hexdigest()
+@functools.lru_cache(maxsize=64)
+def _make_url(url):
+    """Parse a URL string into a QUrl, memoized so repeat navigations skip the parser"""
+    return QUrl(url)
 
 
-def get_all_block_hashes(screen_pixels, block_size):
-    """Divide screen into blocks and get hash for each block"""
-    height, width = screen_pixels.shape[:2]
-    
-    block_hashes = {}
-    
-    for y in range(0, height, block_size):
-        for x in range(0, width, block_size):
-            block_y_end = min(y + block_size, height)
-            block_x_end = min(x + block_size, width)
-            
-            block_pixels = screen_pixels[y:block_y_end, x:block_x_end]
-            block_key = (y // block_size, x // block_size)
-            block_hashes[block_key] = get_block_hash(block_pixels)
-    
-    return block_hashes
+def _search_url(text):
+    """Build the Google search URL for address bar text"""
+    # QUrlQuery leaves '+' as is, which Google reads as a space, so the value is percent-encoded up front
+    search_url = QUrl("https://www.google.com/search")
+    search_url.setQuery("q=" + bytes(QUrl.toPercentEncoding(text)).decode("ascii"))
+    return search_url
+
 
+def _block_starts(length, block_size, stride):
+    """Indices of the first sample in each block along an axis sampled every stride-th pixel"""
+    block_ids = np.arange(length) * stride // block_size
+    return np.flatnonzero(np.diff(block_ids, prepend=-1))
 
-def calculate_change_percentage(previous_hashes, current_hashes):
-    """Calculate percentage of blocks that changed"""
-    if not previous_hashes:
+
+def block_grid(frame_shape, block_size, stride=1):
+    """First sample row and column of every block, for a frame sampled every stride-th pixel"""
+    return _block_starts(frame_shape[0], block_size, stride), _block_starts(frame_shape[1], block_size, stride)
+
+
+def calculate_change_percentage(previous_pixels, current_pixels, grid):
+    """Calculate percentage of blocks whose pixels changed, for blocks laid out by block_grid"""
+    if previous_pixels is None or current_pixels.size == 0:
         return 0.0
+    if previous_pixels.shape != current_pixels.shape:
+        return 100.0
     
-    changed_count = 0
-    total_count = len(current_hashes)
+    row_starts, col_starts = grid
+    changed = tile_changed_mask(current_pixels, previous_pixels, row_starts, col_starts)
     
-    for block_key in current_hashes:
-        if block_key not in previous_hashes or previous_hashes[block_key] != current_hashes[block_key]:
-            changed_count += 1
-    
-    percentage = (changed_count / total_count) * 100 if total_count > 0 else 0
-    return percentage
+    return 100.0 * np.count_nonzero(changed) / changed.size
 
 
 def load_monitoring_config(config_path='config.json'):
@@ -93,6 +201,109 @@ def load_monitoring_config(config_path='config.json'):
     return {}
 
 
+# Suppresses noisy policy, preload, CORS and ad-related console messages on every page
+_CONSOLE_FILTER_JS = """
+(function() {
+    // Suppress console warnings and errors related to policies and headers
+    const originalWarn = console.warn;
+    const originalError = console.error;
+
+    console.warn = function(...args) {
+        const message = args.join(' ');
+        // Filter out common browser-related warnings
+        if (message.includes('Permissions-Policy') || 
+            message.includes('Document-Policy') ||
+            message.includes('preload') ||
+            message.includes('link preload')) {
+            return;
+        }
+        originalWarn.apply(console, args);
+    };
+
+    console.error = function(...args) {
+        const message = args.join(' ');
+        // Filter out CORS and advertisement-related errors
+        if (message.includes('CORS') || 
+            message.includes('doubleclick.net') ||
+            message.includes('XMLHttpRequest')) {
+            return;
+        }
+        originalError.apply(console, args);
+    };
+})();
+"""
+
+
+def _install_console_filter(profile):
+    """Inject script to suppress JavaScript console messages into every page the profile loads"""
+    from PyQt6.QtWebEngineCore import QWebEngineScript
+    
+    console_filter = QWebEngineScript()
+    console_filter.setName("console_filter")
+    console_filter.setSourceCode(_CONSOLE_FILTER_JS)
+    console_filter.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+    console_filter.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
+    console_filter.setRunsOnSubFrames(True)
+    profile.scripts().insert(console_filter)
+
+
+def _ensure_dirs():
+    """Create the cache directories if they don't exist"""
+    for directory in (CACHE_DIR, STORAGE_DIR):
+        os.makedirs(directory, exist_ok=True)
+
+
+_profile = None
+
+
+def _http_cache_bytes(config):
+    """HTTP cache cap from the config's http_cache_mb, falling back to the default for invalid values"""
+    try:
+        megabytes = int(config.get('http_cache_mb', _DEFAULT_HTTP_CACHE_MB))
+    except (TypeError, ValueError):
+        megabytes = _DEFAULT_HTTP_CACHE_MB
+    if megabytes < 0:
+        megabytes = _DEFAULT_HTTP_CACHE_MB
+    # setHttpCacheMaximumSize takes a 32-bit int
+    return min(megabytes, 2047) * 1024 * 1024
+
+
+def get_profile(config):
+    """Return the web engine profile shared by all browser windows, creating it on first use"""
+    global _profile
+    if _profile is not None:
+        return _profile
+    
+    # WebEngine loads Chromium, so it is only imported once a window needs it
+    from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings
+    
+    _ensure_dirs()
+    
+    # Configure storage and cache before any page uses the profile
+    _profile = QWebEngineProfile("pip_video_browser", QApplication.instance())
+    _profile.setPersistentStoragePath(STORAGE_DIR)
+    _profile.setCachePath(CACHE_DIR)
+    _profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+    # A small PIP browser has no use for Chromium's automatic multi-hundred-MB cache
+    _profile.setHttpCacheMaximumSize(_http_cache_bytes(config))
+    _install_console_filter(_profile)
+    
+    # Defaults inherited by every page: no ad-auditing pings or PDF viewer, prefetch DNS for quick navigation
+    profile_settings = _profile.settings()
+    profile_settings.setAttribute(QWebEngineSettings.WebAttribute.HyperlinkAuditingEnabled, False)
+    profile_settings.setAttribute(QWebEngineSettings.WebAttribute.PdfViewerEnabled, False)
+    profile_settings.setAttribute(QWebEngineSettings.WebAttribute.DnsPrefetchEnabled, True)
+    
+    # Suppress JavaScript console warnings and errors
+    _profile.setHttpUserAgent(
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+    
+    # Destroy it, flushing its cache, as the event loop ends; pages scheduled for deletion in closeEvent go first
+    QApplication.instance().aboutToQuit.connect(_profile.deleteLater)
+    return _profile
+
+
 class SelectAllLineEdit(QLineEdit):
     """QLineEdit that selects all text on focus or click"""
     def focusInEvent(self, event):
@@ -104,31 +315,23 @@ class SelectAllLineEdit(QLineEdit):
         self.selectAll()
 
 
+class CtrlButton(QPushButton):
+    """Square control bar button, styled by the window stylesheet's CtrlButton rules"""
+    def __init__(self, text):
+        super().__init__(text)
+        self.setFixedSize(30, 30)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+
 class ConfigDialog(QDialog):
     """Modern config dialog for cache and cookie management"""
-    def __init__(self, parent, cache_path, storage_path):
+    def __init__(self, parent, profile):
         super().__init__(parent)
-        self.cache_path = cache_path
-        self.storage_path = storage_path
+        self.profile = profile
+        self.profile.clearHttpCacheCompleted.connect(self.on_cache_cleared)
         self.setWindowTitle("Settings")
         self.setWindowIcon(create_app_icon())
         self.setFixedSize(400, 250)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e1e2e;
-                border-radius: 8px;
-            }
-            QLabel {
-                color: #cdd6f4;
-                font-family: 'Segoe UI', Arial;
-                font-size: 13px;
-            }
-            QLabel#title {
-                font-size: 16px;
-                font-weight: bold;
-                color: #89b4fa;
-            }
-        """)
         
         layout = QVBoxLayout()
         layout.setSpacing(12)
@@ -140,62 +343,29 @@ class ConfigDialog(QDialog):
         layout.addWidget(title)
         
         # Divider
-        divider = QLabel("─" * 35)
-        divider.setStyleSheet("color: #45475a; margin: 5px 0px;")
+        divider = QFrame()
+        divider.setFrameShape(QFrame.Shape.HLine)
+        divider.setObjectName("divider")
         layout.addWidget(divider)
         
         # Cache section
         cache_label = QLabel("Cache Management")
-        cache_label.setStyleSheet("color: #f38ba8; font-weight: bold;")
+        cache_label.setObjectName("cacheLabel")
         layout.addWidget(cache_label)
         
         self.clear_cache_btn = QPushButton("🗑️  Clear Browser Cache")
-        self.clear_cache_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #313244;
-                color: #cdd6f4;
-                border: 1px solid #45475a;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: 500;
-                font-family: 'Segoe UI', Arial;
-            }
-            QPushButton:hover {
-                background-color: #45475a;
-                border: 1px solid #6c7086;
-            }
-            QPushButton:pressed {
-                background-color: #585b70;
-            }
-        """)
+        self.clear_cache_btn.setObjectName("dialogBtn")
         self.clear_cache_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.clear_cache_btn.clicked.connect(self.clear_cache)
         layout.addWidget(self.clear_cache_btn)
         
         # Cookies section
         cookies_label = QLabel("Cookie Management")
-        cookies_label.setStyleSheet("color: #a6e3a1; font-weight: bold; margin-top: 8px;")
+        cookies_label.setObjectName("cookiesLabel")
         layout.addWidget(cookies_label)
         
         self.clear_cookies_btn = QPushButton("🍪 Clear Cookies")
-        self.clear_cookies_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #313244;
-                color: #cdd6f4;
-                border: 1px solid #45475a;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: 500;
-                font-family: 'Segoe UI', Arial;
-            }
-            QPushButton:hover {
-                background-color: #45475a;
-                border: 1px solid #6c7086;
-            }
-            QPushButton:pressed {
-                background-color: #585b70;
-            }
-        """)
+        self.clear_cookies_btn.setObjectName("dialogBtn")
         self.clear_cookies_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.clear_cookies_btn.clicked.connect(self.clear_cookies)
         layout.addWidget(self.clear_cookies_btn)
@@ -203,8 +373,11 @@ class ConfigDialog(QDialog):
         layout.addStretch()
         
         self.setLayout(layout)
-        
-        # Center dialog on parent
+    
+    def showEvent(self, event):
+        """Center dialog on parent each time it opens, since the dialog is reused"""
+        super().showEvent(event)
+        parent = self.parentWidget()
         if parent:
             parent_geo = parent.geometry()
             dialog_x = parent_geo.x() + (parent_geo.width() - self.width()) // 2
@@ -216,32 +389,27 @@ class ConfigDialog(QDialog):
         reply = QMessageBox.question(self, "Confirm", "Are you sure you want to clear the browser cache?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply != QMessageBox.StandardButton.Yes:
             return
-        try:
-            if os.path.exists(self.cache_path):
-                shutil.rmtree(self.cache_path)
-                os.makedirs(self.cache_path, exist_ok=True)
-            QMessageBox.information(self, "Success", "✓ Browser cache cleared successfully!")
-            self.clear_cache_btn.setText("✓ Cache cleared!")
-            self.clear_cache_btn.setEnabled(False)
-            QTimer.singleShot(2000, lambda: self.reset_cache_button())
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to clear cache: {str(e)}")
+        self.clear_cache_btn.setText("Clearing cache...")
+        self.clear_cache_btn.setEnabled(False)
+        # Runs on Chromium's IO thread; clearHttpCacheCompleted reports back
+        self.profile.clearHttpCache()
+    
+    def on_cache_cleared(self):
+        """Report the result of a cache clear"""
+        QMessageBox.information(self, "Success", "✓ Browser cache cleared successfully!")
+        self.clear_cache_btn.setText("✓ Cache cleared!")
+        QTimer.singleShot(2000, lambda: self.reset_cache_button())
     
     def clear_cookies(self):
         """Clear cookies"""
         reply = QMessageBox.question(self, "Confirm", "Are you sure you want to clear cookies?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply != QMessageBox.StandardButton.Yes:
             return
-        try:
-            if os.path.exists(self.storage_path):
-                shutil.rmtree(self.storage_path)
-                os.makedirs(self.storage_path, exist_ok=True)
-            QMessageBox.information(self, "Success", "✓ Cookies cleared successfully!")
-            self.clear_cookies_btn.setText("✓ Cookies cleared!")
-            self.clear_cookies_btn.setEnabled(False)
-            QTimer.singleShot(2000, lambda: self.reset_cookies_button())
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to clear cookies: {str(e)}")
+        self.profile.cookieStore().deleteAllCookies()
+        QMessageBox.information(self, "Success", "✓ Cookies cleared successfully!")
+        self.clear_cookies_btn.setText("✓ Cookies cleared!")
+        self.clear_cookies_btn.setEnabled(False)
+        QTimer.singleShot(2000, lambda: self.reset_cookies_button())
     
     def reset_cache_button(self):
         """Reset cache button after clearing"""
@@ -265,45 +433,56 @@ class PIPVideoBrowser(QMainWindow):
         self.is_maximized_mode = False
         self.is_web_fullscreen = False
         self.test_movement = test_movement
-        self.start_url = start_url or "https://youtube.com"
-        self.config_file = Path.home() / ".pip_video_browser" / "config.json"
-        self.config_file.parent.mkdir(parents=True, exist_ok=True)
+        # A URL given on the command line wins over the one restored from the last session
+        self.url_from_args = start_url is not None
+        self.start_url = start_url or _DEFAULT_URL
+        self.settings = QSettings("FloatView", "PIPVideoBrowser")
+        # Coalesce bursts of state changes into one write
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._do_save_state)
+        self._last_saved_state = None
         
         # Screen monitoring setup
         self.monitoring_enabled = False
         self.monitor_thread = None
         self.monitor_signals = ScreenMonitorSignals()
         self.monitor_signals.rectangle_detected.connect(self.on_rectangle_detected)
-        self.previous_hashes = None
+        self.previous_frame = None
+        # Latest rectangle not yet handled by the GUI thread; at most one signal is queued for it
+        self._pending_rect = None
+        self._rect_lock = threading.Lock()
         self.camera = None
         self.camera_lock = threading.Lock()
+        # Cuts the monitor loop's sleep between reads short when monitoring stops
+        self._monitor_wake = threading.Event()
+        self._monitor_restart_pending = False
+        # Set on close; a monitor thread still running then releases the camera itself
+        self._closing = False
         
         # Load monitoring config
         self.monitor_config = load_monitoring_config()
         self.screen_width = 0
         self.screen_height = 0
         
+        # Maximized-mode controls, created on first use
+        self.control_bar = None
+        self.url_bar = None
+        
+        # Settings dialog, created on first open
+        self._config_dialog = None
+        
+        # Rounded-corner masks by window size
+        self._mask_cache = {}
+        self._last_mask_size = None
+        
         # Debug overlay
         self.overlay_window = None
         self.overlay_canvas = None
         self.detected_rect = None
         
         # Create persistent web engine profile for cookies and browser data
-        storage_path = str(Path.home() / ".pip_video_browser" / "web_data")
-        cache_path = str(Path.home() / ".pip_video_browser" / "cache")
-        
-        # Create cache directories if they don't exist
-        Path(storage_path).mkdir(parents=True, exist_ok=True)
-        Path(cache_path).mkdir(parents=True, exist_ok=True)
-        
-        self.profile = QWebEngineProfile("pip_video_browser", None)
-        self.profile.setPersistentStoragePath(storage_path)
-        self.profile.setCachePath(cache_path)
-        
-        # Suppress JavaScript console warnings and errors
-        self.profile.setHttpUserAgent(
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        self.profile = get_profile(self.monitor_config)
         
         self.setWindowTitle("PIP Video Browser")
         self.setWindowIcon(create_app_icon())
@@ -316,10 +495,6 @@ class PIPVideoBrowser(QMainWindow):
         self.init_ui()
         self.load_state()
         self.setMouseTracking(True)
-        self.resize_timer = QTimer()
-        self.resize_timer.timeout.connect(self.update_size)
-        self.move_timer = QTimer()
-        self.move_timer.timeout.connect(self.update_position)
         
         # Test movement timer
         if self.test_movement:
@@ -332,23 +507,25 @@ class PIPVideoBrowser(QMainWindow):
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
         
-        # Set rounded corners on main widget
-        main_widget.setStyleSheet("""
-            QWidget {
-                border-radius: 12px;
-            }
-        """)
-        
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
+        self.main_layout = main_layout
+        
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+        from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
         
         # Create web engine first (needed by control buttons)
         self.web_view = QWebEngineView()
         page = QWebEnginePage(self.profile, self.web_view)
         
-        # Enable fullscreen support for video players
-        page.settings().setAttribute(QWebEngineSettings.WebAttribute.FullScreenSupportEnabled, True)
+        # Enable fullscreen support for video players, and skip engine features a video page doesn't use
+        settings = page.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.FullScreenSupportEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, False)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.WebGLEnabled, False)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadIconsForPage, False)
         
         # Set initial zoom to fit content
         self.web_view.setZoomFactor(1.0)
@@ -356,197 +533,87 @@ class PIPVideoBrowser(QMainWindow):
         # Handle fullscreen requests from web content (YouTube, Netflix, etc.)
         page.fullScreenRequested.connect(self.handle_fullscreen_request)
         
-        # Inject script to suppress JavaScript console messages
-        script = """
-        (function() {
-            // Suppress console warnings and errors related to policies and headers
-            const originalWarn = console.warn;
-            const originalError = console.error;
-            
-            console.warn = function(...args) {
-                const message = args.join(' ');
-                // Filter out common browser-related warnings
-                if (message.includes('Permissions-Policy') || 
-                    message.includes('Document-Policy') ||
-                    message.includes('preload') ||
-                    message.includes('link preload')) {
-                    return;
-                }
-                originalWarn.apply(console, args);
-            };
-            
-            console.error = function(...args) {
-                const message = args.join(' ');
-                // Filter out CORS and advertisement-related errors
-                if (message.includes('CORS') || 
-                    message.includes('doubleclick.net') ||
-                    message.includes('XMLHttpRequest')) {
-                    return;
-                }
-                originalError.apply(console, args);
-            };
-        })();
-        """
-        page.runJavaScript(script)
-        
         self.web_view.setPage(page)
         
         # Compact mode button (shown in compact mode, top)
         self.maximize_btn = QPushButton("⛶")
         self.maximize_btn.setFixedWidth(30)
         self.maximize_btn.setFixedHeight(30)
-        self.maximize_btn.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(0, 0, 0, 0.7);
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: rgba(100, 150, 255, 0.15);
-            }
-            QPushButton:pressed {
-                background-color: rgba(80, 120, 200, 0.25);
-            }
-        """)
+        self.maximize_btn.setObjectName("maximizeBtn")
         self.maximize_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.maximize_btn.clicked.connect(self.toggle_mode)
         main_layout.addWidget(self.maximize_btn)
         
-        # Control bar (shown in maximized mode, top)
+        # Control bar (shown in maximized mode, top) is built on first use by _build_control_bar
+        
+        # Add loading progress bar (shown under control bar)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumHeight(3)
+        self.progress_bar.hide()
+        main_layout.addWidget(self.progress_bar)
+        
+        # Connect web view loading signals
+        self.web_view.loadStarted.connect(self.on_load_started)
+        self.web_view.loadProgress.connect(self.on_load_progress)
+        self.web_view.loadFinished.connect(self.on_load_finished)
+        
+        # Connect URL changed signal to update URL bar, coalescing bursts of SPA history updates
+        self._url_timer = QTimer(self)
+        self._url_timer.setSingleShot(True)
+        self._url_timer.setInterval(100)
+        self._url_timer.timeout.connect(self.update_url_bar)
+        self.web_view.urlChanged.connect(lambda _: self._url_timer.start())
+        
+        # Add web engine to layout (fills remaining space)
+        main_layout.addWidget(self.web_view, 1)
+        
+        main_widget.setLayout(main_layout)
+        self.set_compact_mode()
+
+    def _build_control_bar(self):
+        """Create the control bar (shown in maximized mode, top) the first time it is needed"""
         self.control_bar = QWidget()
         control_layout = QHBoxLayout(self.control_bar)
         control_layout.setContentsMargins(5, 5, 5, 5)
         control_layout.setSpacing(5)
         
-        # Button styling
-        button_style = """
-            QPushButton {
-                background-color: rgba(0, 0, 0, 0.7);
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-weight: bold;
-                padding: 5px;
-            }
-            QPushButton:hover {
-                background-color: rgba(100, 150, 255, 0.15);
-            }
-            QPushButton:pressed {
-                background-color: rgba(80, 120, 200, 0.25);
-            }
-        """
-        
-        self.back_btn = QPushButton("◀")
-        self.back_btn.setFixedWidth(30)
-        self.back_btn.setFixedHeight(30)
-        self.back_btn.setStyleSheet(button_style)
-        self.back_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.back_btn = CtrlButton("◀")
         self.back_btn.clicked.connect(self.web_view.back)
         control_layout.addWidget(self.back_btn)
         
-        self.forward_btn = QPushButton("▶")
-        self.forward_btn.setFixedWidth(30)
-        self.forward_btn.setFixedHeight(30)
-        self.forward_btn.setStyleSheet(button_style)
-        self.forward_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.forward_btn = CtrlButton("▶")
         self.forward_btn.clicked.connect(self.web_view.forward)
         control_layout.addWidget(self.forward_btn)
         
-        self.refresh_btn = QPushButton("⟳")
-        self.refresh_btn.setFixedWidth(30)
-        self.refresh_btn.setFixedHeight(30)
-        self.refresh_btn.setStyleSheet(button_style)
-        self.refresh_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.refresh_btn = CtrlButton("⟳")
         self.refresh_btn.clicked.connect(self.web_view.reload)
         control_layout.addWidget(self.refresh_btn)
         
         self.url_bar = SelectAllLineEdit()
         self.url_bar.setPlaceholderText("Enter URL...")
         self.url_bar.returnPressed.connect(self.navigate_to_url)
-        self.url_bar.setStyleSheet("""
-            QLineEdit {
-                border-radius: 8px;
-                padding: 5px;
-                background-color: rgba(0, 0, 0, 0.7);
-                color: white;
-                border: none;
-            }
-            QLineEdit:hover {
-                background-color: rgba(100, 150, 255, 0.15);
-            }
-            QLineEdit:focus {
-                background-color: rgba(80, 120, 200, 0.25);
-            }
-        """)
+        self.url_bar.setObjectName("urlBar")
+        self.url_bar.setText(self.web_view.url().toString())
         control_layout.addWidget(self.url_bar)
         
-        self.settings_btn = QPushButton("⚙️")
-        self.settings_btn.setFixedWidth(30)
-        self.settings_btn.setFixedHeight(30)
-        self.settings_btn.setStyleSheet(button_style)
-        self.settings_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.settings_btn = CtrlButton("⚙️")
         self.settings_btn.clicked.connect(self.open_config_menu)
         control_layout.addWidget(self.settings_btn)
         
-        self.close_btn = QPushButton("✕")
-        self.close_btn.setFixedWidth(30)
-        self.close_btn.setFixedHeight(30)
-        self.close_btn.setStyleSheet(button_style)
-        self.close_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.close_btn = CtrlButton("✕")
         self.close_btn.clicked.connect(self.close)
         control_layout.addWidget(self.close_btn)
         
-        main_layout.addWidget(self.control_bar)
-        
-        # Add loading progress bar (shown under control bar)
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setMaximumHeight(3)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: none;
-                background-color: transparent;
-                margin: 0px;
-                padding: 0px;
-            }
-            QProgressBar::chunk {
-                background-color: rgba(100, 150, 255, 0.9);
-            }
-        """)
-        self.progress_bar.hide()
-        main_layout.addWidget(self.progress_bar)
-        
-        # Connect web view loading signals
-        self.web_view.loadStarted.connect(self.on_load_started)
-        self.web_view.loadProgress.connect(self.on_load_progress)
-        self.web_view.loadFinished.connect(self.on_load_finished)
-        
-        # Connect URL changed signal to update URL bar
-        self.web_view.urlChanged.connect(self.on_url_changed)
-        
-        # Add web engine to layout (fills remaining space)
-        main_layout.addWidget(self.web_view, 1)
-        
-        main_widget.setLayout(main_layout)
-        self.set_compact_mode()
-        
-        # Load default URL
-        self.web_view.setUrl(QUrl(self.start_url))
+        # Sits between the maximize button and the progress bar
+        self.main_layout.insertWidget(1, self.control_bar)
 
     def set_compact_mode(self):
         """Switch to compact mode (minimal UI)"""
         self.is_maximized_mode = False
-        self.control_bar.hide()
+        if self.control_bar is not None:
+            self.control_bar.hide()
         self.maximize_btn.hide()
         self.resize(640, 480)
-        self.setWindowFlags(
-            Qt.WindowType.Window |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.FramelessWindowHint
-        )
-        self.show()
-        self.apply_rounded_corners()
         self.adjust_web_zoom()
         
         # Start screen monitoring in compact mode (unless test_movement is enabled)
@@ -556,16 +623,11 @@ class PIPVideoBrowser(QMainWindow):
     def set_maximized_mode(self):
         """Switch to maximized mode (full controls)"""
         self.is_maximized_mode = True
+        if self.control_bar is None:
+            self._build_control_bar()
         self.control_bar.show()
         self.maximize_btn.hide()
         self.resize(900, 600)
-        self.setWindowFlags(
-            Qt.WindowType.Window |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.FramelessWindowHint
-        )
-        self.show()
-        self.apply_rounded_corners()
         self.adjust_web_zoom()
         
         # Stop screen monitoring in maximized mode
@@ -580,20 +642,23 @@ class PIPVideoBrowser(QMainWindow):
         self.save_state()
 
     def apply_rounded_corners(self):
-        """Apply rounded corners to the window with antialiasing"""
-        from PyQt6.QtGui import QBitmap, QPainter
-        
-        # Create a bitmap mask
-        mask = QBitmap(self.size())
-        mask.fill(Qt.GlobalColor.white)
-        
-        # Draw rounded rectangle on the bitmap with antialiasing
-        painter = QPainter(mask)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-        painter.setBrush(Qt.GlobalColor.black)
-        painter.drawRoundedRect(0, 0, self.width(), self.height(), 6, 6)
-        painter.end()
+        """Apply rounded corners to the window"""
+        if self.size() == self._last_mask_size:
+            return
+        self._last_mask_size = self.size()
+        
+        # Masks are reused per window size; detected rectangles vary, so keep only a few
+        key = (self.width(), self.height())
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            # Window masks are 1-bit, so a region traced from the rounded rect matches a painted bitmap
+            path = QPainterPath()
+            path.addRoundedRect(0, 0, self.width(), self.height(), 6, 6)
+            mask = QRegion(path.toFillPolygon().toPolygon())
+            
+            if len(self._mask_cache) >= 8:
+                self._mask_cache.clear()
+            self._mask_cache[key] = mask
         
         self.setMask(mask)
     
@@ -639,39 +704,29 @@ class PIPVideoBrowser(QMainWindow):
         url = self.url_bar.text().strip()
         if not url:
             return
+        # Submitted, so the bar may show the page URL again
+        self.url_bar.setModified(False)
         
-        # Check if it looks like a URL (contains a dot or is localhost)
-        if "." in url or url.lower().startswith("localhost"):
-            if not url.startswith(("http://", "https://")):
+        # Check if it looks like a URL (has a scheme, is localhost, or starts with a dotted host)
+        if _URL_RE.match(url):
+            if not url.lower().startswith(("http://", "https://")):
                 url = "https://" + url
-            self.web_view.setUrl(QUrl(url))
+            self.web_view.setUrl(_make_url(url))
         else:
             # Search Google for non-URL input
-            search_url = f"https://www.google.com/search?q={url.replace(' ', '+')}"
-            self.web_view.setUrl(QUrl(search_url))
+            self.web_view.setUrl(_search_url(url))
 
-    def on_url_changed(self):
-        """Update URL bar when the web view's URL changes"""
-        self.url_bar.setText(self.web_view.url().toString())
+    def update_url_bar(self):
+        """Show the web view's URL in the URL bar, unless it holds text the user has not submitted yet"""
+        if self.url_bar is not None and not self.url_bar.isModified():
+            self.url_bar.setText(self.web_view.url().toString())
 
     def open_config_menu(self):
         """Open the configuration menu dialog"""
-        cache_path = str(Path.home() / ".pip_video_browser" / "cache")
-        storage_path = str(Path.home() / ".pip_video_browser" / "web_data")
-        config_dialog = ConfigDialog(self, cache_path, storage_path)
-        config_dialog.exec()
-
-    def set_position(self, x, y):
-        """Non-blocking position change"""
-        self.pending_x = x
-        self.pending_y = y
-        self.move_timer.start(0)
-
-    def update_position(self):
-        """Update position non-blocking"""
-        if hasattr(self, 'pending_x') and hasattr(self, 'pending_y'):
-            self.move(self.pending_x, self.pending_y)
-            self.move_timer.stop()
+        # Built on first use and reused afterwards
+        if self._config_dialog is None:
+            self._config_dialog = ConfigDialog(self, self.profile)
+        self._config_dialog.exec()
 
     def random_move_and_resize(self):
         """Move window to random position and size (for testing) - only in compact mode"""
@@ -694,14 +749,19 @@ class PIPVideoBrowser(QMainWindow):
         
         # Apply new geometry
         self.setGeometry(new_x, new_y, new_width, new_height)
-        self.apply_rounded_corners()
     
     def start_screen_monitoring(self):
         """Start the screen monitoring thread"""
         if self.monitor_thread is not None and self.monitor_thread.is_alive():
+            # A stopped loop exits after its current frame or search; retry once it has, without
+            # blocking the GUI thread
+            if not self.monitoring_enabled and not self._monitor_restart_pending:
+                self._monitor_restart_pending = True
+                QTimer.singleShot(50, self._retry_start_monitoring)
             return
         
         self.monitoring_enabled = True
+        self._monitor_wake.clear()
         
         # Initialize camera if not already created
         with self.camera_lock:
@@ -720,6 +780,12 @@ class PIPVideoBrowser(QMainWindow):
         self.monitor_thread.start()
         print("🔍 Screen monitoring started")
     
+    def _retry_start_monitoring(self):
+        """Start monitoring deferred by start_screen_monitoring, unless it was stopped again meanwhile"""
+        if self._monitor_restart_pending:
+            self._monitor_restart_pending = False
+            self.start_screen_monitoring()
+    
     def _create_overlay_window(self):
         """Create transparent overlay window for debug visualization"""
         if self.overlay_window is not None:
@@ -787,6 +853,9 @@ class PIPVideoBrowser(QMainWindow):
     def stop_screen_monitoring(self):
         """Stop the screen monitoring thread"""
         self.monitoring_enabled = False
+        self._monitor_restart_pending = False
+        # The monitor thread stops capture itself once it sees the flag
+        self._monitor_wake.set()
         
         # Destroy overlay window
         if self.overlay_window is not None:
@@ -801,20 +870,29 @@ class PIPVideoBrowser(QMainWindow):
     
     def _monitor_loop(self):
         """Background monitoring loop"""
+        capture_fps, read_interval = capture_pacing(self.monitor_config.get('update_rate', 0.1))
+        
+        with self.camera_lock:
+            camera = self.camera
+            if camera is None:
+                print("Camera not initialized")
+                return
+            # Let bettercam pace capture. video_mode repeats the last frame when the desktop is idle, so
+            # get_latest_frame() never waits longer than one period; only this thread starts and stops
+            # capture, so it never waits on a stopped camera
+            camera.start(target_fps=capture_fps, video_mode=True)
+        
         try:
             # Initial capture to get screen dimensions
-            with self.camera_lock:
-                if self.camera is None:
-                    print("Camera not initialized")
-                    return
-                screen_capture = self.camera.grab()
+            screen_capture = camera.get_latest_frame()
             
-            if screen_capture is None:
+            if not isinstance(screen_capture, np.ndarray) or screen_capture.ndim != 3 or screen_capture.shape[-1] != 3:
                 print("Failed to grab initial screen capture")
                 return
             
-            screen_pixels = np.array(screen_capture)
-            screen_pixels = screen_pixels[:, :, [2, 1, 0]]
+            # get_latest_frame() already returns a private BGR copy, used as is; seed growth and change
+            # detection treat the three channels alike, so they are not reordered
+            screen_pixels = screen_capture
             
             self.screen_height, self.screen_width = screen_pixels.shape[:2]
             
@@ -822,47 +900,62 @@ class PIPVideoBrowser(QMainWindow):
             print("🌱 Performing initial seed growth search...")
             self._search_and_emit(screen_pixels)
             
-            # Initialize block hashes
             block_size = self.monitor_config.get('block_size', 100)
-            self.previous_hashes = get_all_block_hashes(screen_pixels, block_size)
+            # Change detection only needs a handful of samples per block side
+            stride = max(1, block_size // 8)
+            self.previous_frame = np.ascontiguousarray(screen_pixels[::stride, ::stride])
+            # Block layout is fixed for a screen size, so it is only recomputed when that changes
+            grid = block_grid(self.previous_frame.shape, block_size, stride)
             
-            update_rate = self.monitor_config.get('update_rate', 0.1)
             change_threshold = self.monitor_config.get('change_threshold', 30.0)
+            confirm_frames = max(1, self.monitor_config.get('confirm_frames', 3))
             iteration = 0
+            change_streak = 0
             
             while self.monitoring_enabled:
-                time.sleep(update_rate)
+                if read_interval and self._monitor_wake.wait(read_interval):
+                    break
+                # Blocks until the capture thread delivers its next frame
+                screen_capture = camera.get_latest_frame()
                 iteration += 1
                 
-                with self.camera_lock:
-                    if self.camera is None:
-                        break
-                    screen_capture = self.camera.grab()
-                
-                if screen_capture is None:
+                if not self.monitoring_enabled:
+                    break
+                if not isinstance(screen_capture, np.ndarray) or screen_capture.ndim != 3 or screen_capture.shape[-1] != 3:
                     continue
+                screen_pixels = screen_capture
                 
-                try:
-                    screen_pixels = np.array(screen_capture)
-                    if screen_pixels.ndim < 3:
-                        continue
-                    screen_pixels = screen_pixels[:, :, [2, 1, 0]]
-                except (IndexError, ValueError):
-                    continue
-                
-                current_hashes = get_all_block_hashes(screen_pixels, block_size)
-                change_percentage = calculate_change_percentage(self.previous_hashes, current_hashes)
+                sampled = np.ascontiguousarray(screen_pixels[::stride, ::stride])
+                if sampled.shape != self.previous_frame.shape:
+                    grid = block_grid(sampled.shape, block_size, stride)
+                change_percentage = calculate_change_percentage(self.previous_frame, sampled, grid)
                 
+                # A change must last confirm_frames checks before searching. Until then the frame from
+                # before the change stays the reference, so a lasting change keeps counting while a
+                # one-frame flicker resets the streak and animated content searches at most every
+                # confirm_frames checks
                 if change_percentage > change_threshold:
+                    change_streak += 1
+                    if change_streak < confirm_frames:
+                        continue
                     print(f"[{iteration:03d}] {change_percentage:5.1f}% blocks changed - searching for new rectangle")
                     self._search_and_emit(screen_pixels)
                 
-                self.previous_hashes = current_hashes
+                change_streak = 0
+                self.previous_frame = sampled
         
         except Exception as e:
             print(f"Monitor error: {e}")
             import traceback
             traceback.print_exc()
+        
+        finally:
+            with self.camera_lock:
+                if self.camera is not None:
+                    self.camera.stop()
+                    if self._closing:
+                        self.camera.release()
+                        self.camera = None
     
     def _search_and_emit(self, screen_pixels):
         """Search for rectangle and emit signal"""
@@ -895,17 +988,31 @@ class PIPVideoBrowser(QMainWindow):
                 exclusion_zone=exclusion_zone
             )
             
-            if results:
-                coords, area = results[0]
-                x1, y1, x2, y2 = coords
-                self.monitor_signals.rectangle_detected.emit(x1, y1, x2, y2, area)
-                print(f"  → Rectangle detected: ({x1}, {y1}, {x2}, {y2}) - {area} px²")
+            self._emit_results(results)
         
         except Exception as e:
             print(f"Error in seed growth: {e}")
     
+    def _emit_results(self, results):
+        """Emit the best seed growth rectangle, if any"""
+        if results:
+            coords, area = results[0]
+            x1, y1, x2, y2 = coords
+            with self._rect_lock:
+                queued = self._pending_rect is not None
+                self._pending_rect = (x1, y1, x2, y2, area)
+            if not queued:
+                self.monitor_signals.rectangle_detected.emit(x1, y1, x2, y2, area)
+            print(f"  → Rectangle detected: ({x1}, {y1}, {x2}, {y2}) - {area} px²")
+    
     def on_rectangle_detected(self, x1, y1, x2, y2, area):
         """Handle detected rectangle - position PIP window inside it"""
+        # Detections made while this one was queued replace it
+        with self._rect_lock:
+            if self._pending_rect is not None:
+                x1, y1, x2, y2, area = self._pending_rect
+                self._pending_rect = None
+        
         # Store detected rectangle for overlay
         self.detected_rect = (x1, y1, x2, y2)
         
@@ -931,56 +1038,52 @@ class PIPVideoBrowser(QMainWindow):
             
             # Apply the logical coordinates to Qt window
             self.setGeometry(logical_x1, logical_y1, logical_width, logical_height)
-            self.apply_rounded_corners()
             self.adjust_web_zoom()
             
             # Debug overlay disabled
             # QTimer.singleShot(0, self._update_overlay)
 
-    def set_size(self, width, height):
-        """Non-blocking resize"""
-        self.pending_width = width
-        self.pending_height = height
-        self.resize_timer.start(0)
-
-    def update_size(self):
-        """Update size non-blocking"""
-        if hasattr(self, 'pending_width') and hasattr(self, 'pending_height'):
-            self.resize(self.pending_width, self.pending_height)
-            self.resize_timer.stop()
-
     def save_state(self):
-        """Persist window state to disk"""
+        """Schedule a state save, restarting the countdown on every call"""
+        self._save_timer.start(500)
+
+    def _do_save_state(self):
+        """Persist window state via QSettings, skipping the write when nothing changed"""
         state = {
             "x": self.x(),
             "y": self.y(),
             "width": self.width(),
             "height": self.height(),
             "is_maximized": self.is_maximized_mode,
-            "url": self.url_bar.text() or self.start_url
+            "url": self.web_view.url().toString() or self.start_url
         }
-        with open(self.config_file, "w") as f:
-            json.dump(state, f, indent=2)
+        if state == self._last_saved_state:
+            return
+        for key, value in state.items():
+            self.settings.setValue(key, value)
+        self._last_saved_state = state
 
     def load_state(self):
-        """Restore window state from disk"""
-        if self.config_file.exists():
+        """Restore window state from QSettings"""
+        if self.settings.contains("x"):
             try:
-                with open(self.config_file, "r") as f:
-                    state = json.load(f)
-                self.move(state.get("x", 100), state.get("y", 100))
-                self.resize(state.get("width", 640), state.get("height", 480))
+                self.move(self.settings.value("x", 100, type=int), self.settings.value("y", 100, type=int))
+                self.resize(self.settings.value("width", 640, type=int), self.settings.value("height", 480, type=int))
                 
-                if state.get("is_maximized", False):
+                if self.settings.value("is_maximized", False, type=bool):
                     self.set_maximized_mode()
                 else:
                     self.set_compact_mode()
-                    
-                self.web_view.setUrl(QUrl(self.start_url))
+                
+                if not self.url_from_args:
+                    self.start_url = self.settings.value("url", self.start_url, type=str) or self.start_url
             except Exception as e:
                 print(f"Error loading state: {e}")
         else:
             self.move(100, 100)
+        
+        # The only navigation at startup; update_url_bar fills the URL bar
+        self.web_view.setUrl(_make_url(self.start_url))
 
     def handle_fullscreen_request(self, request):
         """Handle fullscreen requests from web content (YouTube, Netflix, etc.)"""
@@ -1003,33 +1106,49 @@ class PIPVideoBrowser(QMainWindow):
     def resizeEvent(self, event):
         """Handle window resize event"""
         super().resizeEvent(event)
+        # The only place the mask is rebuilt; mode switches and repositioning all end up here
+        self.apply_rounded_corners()
         self.adjust_web_zoom()
     
     def closeEvent(self, event):
         """Handle window close event"""
-        self.save_state()
+        self._save_timer.stop()
+        self._do_save_state()
         
         # Stop screen monitoring
+        self._closing = True
         self.stop_screen_monitoring()
         
-        # Release camera
-        with self.camera_lock:
-            if self.camera:
-                try:
-                    self.camera.release()
-                except:
-                    pass
-                self.camera = None
+        # Only the monitor thread touches the camera while it runs, so give it a moment to exit; if it
+        # is still searching, it releases the camera itself
+        if self.monitor_thread is not None:
+            self.monitor_thread.join(timeout=0.5)
         
-        # Properly clean up web page before closing
+        # Release camera
+        if self.monitor_thread is None or not self.monitor_thread.is_alive():
+            with self.camera_lock:
+                if self.camera:
+                    try:
+                        self.camera.release()
+                    except:
+                        pass
+                    self.camera = None
+        
+        # Properly clean up web page before closing; it must go before the profile it uses
         if hasattr(self, 'web_view') and self.web_view.page():
+            page = self.web_view.page()
             self.web_view.setPage(None)
+            page.deleteLater()
         event.accept()
 
 
 def main():
+    # Required when QtWebEngineWidgets is imported after the QApplication exists
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setWindowIcon(create_app_icon())
+    # Widgets pick their rules up by class or object name
+    app.setStyleSheet(_APP_QSS)
     
     start_url = None
     test_movement = False
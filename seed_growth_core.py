@@ -1,115 +1,224 @@
 from dataclasses import dataclass
 import numpy as np
-from numba import jit
+from numba import jit, prange
 import time
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def compare_avg_color_numba(current_pixels, next_pixels, sample_rate):
-    h1, w1 = current_pixels.shape[0], current_pixels.shape[1]
-    h2, w2 = next_pixels.shape[0], next_pixels.shape[1]
-    
-    r1, g1, b1, count1 = 0, 0, 0, 0
-    for i in range(0, h1, sample_rate):
-        for j in range(0, w1, sample_rate):
-            r1 += current_pixels[i, j, 0]
-            g1 += current_pixels[i, j, 1]
-            b1 += current_pixels[i, j, 2]
-            count1 += 1
-    
-    r2, g2, b2, count2 = 0, 0, 0, 0
-    for i in range(0, h2, sample_rate):
-        for j in range(0, w2, sample_rate):
-            r2 += next_pixels[i, j, 0]
-            g2 += next_pixels[i, j, 1]
-            b2 += next_pixels[i, j, 2]
-            count2 += 1
+    current_samples = current_pixels[::sample_rate, ::sample_rate]
+    next_samples = next_pixels[::sample_rate, ::sample_rate]
+    count1 = current_samples.shape[0] * current_samples.shape[1]
+    count2 = next_samples.shape[0] * next_samples.shape[1]
     
     if count1 == 0 or count2 == 0:
         return False
     
-    return (r1 // count1 != r2 // count2) or (g1 // count1 != g2 // count2) or (b1 // count1 != b2 // count2)
+    # Array sums let LLVM vectorize the reduction that the hand-written accumulators kept scalar
+    for c in range(3):
+        if current_samples[:, :, c].sum() // count1 != next_samples[:, :, c].sum() // count2:
+            return True
+    
+    return False
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
+def _line_mean(line):
+    count = line.shape[0]
+    if count == 0:
+        return 0
+    return line.sum() // count
+
+
+@jit(nopython=True, cache=True)
 def compare_corner_horizontal_numba(current_pixels, next_pixels, sample_rate):
-    h1, w1 = current_pixels.shape[0], current_pixels.shape[1]
-    h2, w2 = next_pixels.shape[0], next_pixels.shape[1]
+    w1 = current_pixels.shape[1]
     
-    current_edge = np.zeros((w1, 3), dtype=np.uint8)
-    for j in range(w1):
-        r_sum, g_sum, b_sum, count = 0, 0, 0, 0
-        for i in range(h1):
-            r_sum += current_pixels[i, j, 0]
-            g_sum += current_pixels[i, j, 1]
-            b_sum += current_pixels[i, j, 2]
-            count += 1
-        if count > 0:
-            current_edge[j, 0] = r_sum // count
-            current_edge[j, 1] = g_sum // count
-            current_edge[j, 2] = b_sum // count
+    # Only the first, middle and last columns are compared, so only those are averaged
+    for idx in (0, w1 // 2, w1 - 1):
+        for c in range(3):
+            if _line_mean(current_pixels[:, idx, c]) != _line_mean(next_pixels[:, idx, c]):
+                return True
     
-    next_edge = np.zeros((w2, 3), dtype=np.uint8)
-    for j in range(w2):
-        r_sum, g_sum, b_sum, count = 0, 0, 0, 0
-        for i in range(h2):
-            r_sum += next_pixels[i, j, 0]
-            g_sum += next_pixels[i, j, 1]
-            b_sum += next_pixels[i, j, 2]
-            count += 1
-        if count > 0:
-            next_edge[j, 0] = r_sum // count
-            next_edge[j, 1] = g_sum // count
-            next_edge[j, 2] = b_sum // count
+    return False
+
+
+@jit(nopython=True, cache=True)
+def compare_corner_vertical_numba(current_pixels, next_pixels, sample_rate):
+    h1 = current_pixels.shape[0]
     
-    corner_indices = [0, w1 // 2, w1 - 1]
-    for idx in corner_indices:
-        if (current_edge[idx, 0] != next_edge[idx, 0] or
-            current_edge[idx, 1] != next_edge[idx, 1] or
-            current_edge[idx, 2] != next_edge[idx, 2]):
-            return True
+    # Only the first, middle and last rows are compared, so only those are averaged
+    for idx in (0, h1 // 2, h1 - 1):
+        for c in range(3):
+            if _line_mean(current_pixels[idx, :, c]) != _line_mean(next_pixels[idx, :, c]):
+                return True
     
     return False
 
 
-@jit(nopython=True)
-def compare_corner_vertical_numba(current_pixels, next_pixels, sample_rate):
-    h1, w1 = current_pixels.shape[0], current_pixels.shape[1]
-    h2, w2 = next_pixels.shape[0], next_pixels.shape[1]
+WALL_TOP = 0
+WALL_BOTTOM = 1
+WALL_LEFT = 2
+WALL_RIGHT = 3
+
+# Wall locks of a seed are one bitmask with a bit per wall
+LOCK_TOP = 1 << WALL_TOP
+LOCK_BOTTOM = 1 << WALL_BOTTOM
+LOCK_LEFT = 1 << WALL_LEFT
+LOCK_RIGHT = 1 << WALL_RIGHT
+LOCK_VERTICAL = LOCK_TOP | LOCK_BOTTOM
+LOCK_HORIZONTAL = LOCK_LEFT | LOCK_RIGHT
+_LOCK_COUNT = np.array([bin(locks).count('1') for locks in range(16)], dtype=np.uint8)
+
+
+@jit(nopython=True, cache=True)
+def _wall_changed(screen_pixels, x1, y1, x2, y2, wall, thickness, lookahead, sample_rate, average):
+    """Compare a wall with the strip lookahead pixels further out, False if the wall cannot move"""
+    screen_height, screen_width = screen_pixels.shape[0], screen_pixels.shape[1]
     
-    current_edge = np.zeros((h1, 3), dtype=np.uint8)
-    for i in range(h1):
-        r_sum, g_sum, b_sum, count = 0, 0, 0, 0
-        for j in range(w1):
-            r_sum += current_pixels[i, j, 0]
-            g_sum += current_pixels[i, j, 1]
-            b_sum += current_pixels[i, j, 2]
-            count += 1
-        if count > 0:
-            current_edge[i, 0] = r_sum // count
-            current_edge[i, 1] = g_sum // count
-            current_edge[i, 2] = b_sum // count
+    if wall == WALL_TOP:
+        next_y = max(0, y1 - lookahead)
+        if next_y == y1:
+            return False
+        current_pixels = screen_pixels[y1:y1+thickness, x1:x2]
+        next_pixels = screen_pixels[next_y:next_y+thickness, x1:x2]
+    elif wall == WALL_BOTTOM:
+        next_y = min(screen_height, y2 + lookahead)
+        if next_y == y2:
+            return False
+        current_pixels = screen_pixels[y2-thickness:y2, x1:x2]
+        next_pixels = screen_pixels[next_y-thickness:next_y, x1:x2]
+    elif wall == WALL_LEFT:
+        next_x = max(0, x1 - lookahead)
+        if next_x == x1:
+            return False
+        current_pixels = screen_pixels[y1:y2, x1:x1+thickness]
+        next_pixels = screen_pixels[y1:y2, next_x:next_x+thickness]
+    else:
+        next_x = min(screen_width, x2 + lookahead)
+        if next_x == x2:
+            return False
+        current_pixels = screen_pixels[y1:y2, x2-thickness:x2]
+        next_pixels = screen_pixels[y1:y2, next_x-thickness:next_x]
     
-    next_edge = np.zeros((h2, 3), dtype=np.uint8)
-    for i in range(h2):
-        r_sum, g_sum, b_sum, count = 0, 0, 0, 0
-        for j in range(w2):
-            r_sum += next_pixels[i, j, 0]
-            g_sum += next_pixels[i, j, 1]
-            b_sum += next_pixels[i, j, 2]
-            count += 1
-        if count > 0:
-            next_edge[i, 0] = r_sum // count
-            next_edge[i, 1] = g_sum // count
-            next_edge[i, 2] = b_sum // count
+    # A seed planted on the screen edge can have an empty wall; there is no color to compare
+    if current_pixels.shape[0] == 0 or current_pixels.shape[1] == 0:
+        return False
     
-    corner_indices = [0, h1 // 2, h1 - 1]
-    for idx in corner_indices:
-        if (current_edge[idx, 0] != next_edge[idx, 0] or
-            current_edge[idx, 1] != next_edge[idx, 1] or
-            current_edge[idx, 2] != next_edge[idx, 2]):
-            return True
+    if average:
+        return compare_avg_color_numba(current_pixels, next_pixels, sample_rate)
+    if wall == WALL_TOP or wall == WALL_BOTTOM:
+        return compare_corner_horizontal_numba(current_pixels, next_pixels, sample_rate)
+    return compare_corner_vertical_numba(current_pixels, next_pixels, sample_rate)
+
+
+@jit(nopython=True, parallel=True, cache=True)
+def check_walls_batch(screen_pixels, x1, y1, x2, y2, locks, growth_complete, active,
+                      thickness, lookahead, sample_rate, average, exclusion_zone):
+    """Lock every wall of the active seeds that hit the screen edge, the exclusion zone or a color change
+
+    exclusion_zone is (x1, y1, x2, y2), or empty when there is none.
+    """
+    screen_height, screen_width = screen_pixels.shape[0], screen_pixels.shape[1]
+    has_exclusion = exclusion_zone.shape[0] == 4
+    ex_x1, ex_y1, ex_x2, ex_y2 = 0, 0, 0, 0
+    if has_exclusion:
+        ex_x1, ex_y1, ex_x2, ex_y2 = exclusion_zone[0], exclusion_zone[1], exclusion_zone[2], exclusion_zone[3]
     
-    return False
+    for k in prange(active.shape[0]):
+        i = active[k]
+        sx1, sy1, sx2, sy2 = x1[i], y1[i], x2[i], y2[i]
+        seed_locks = locks[i]
+        
+        # A wall locks at the screen edge, when moving toward the exclusion zone, or on a color change
+        top = ((seed_locks & LOCK_TOP) != 0 or sy1 - lookahead < 0 or
+               (has_exclusion and sy2 > ex_y1 and sy1 - lookahead < ex_y2) or
+               _wall_changed(screen_pixels, sx1, sy1, sx2, sy2, WALL_TOP, thickness, lookahead, sample_rate, average))
+        bottom = ((seed_locks & LOCK_BOTTOM) != 0 or sy2 + lookahead >= screen_height or
+                  (has_exclusion and sy1 < ex_y2 and sy2 + lookahead > ex_y1) or
+                  _wall_changed(screen_pixels, sx1, sy1, sx2, sy2, WALL_BOTTOM, thickness, lookahead, sample_rate, average))
+        left = ((seed_locks & LOCK_LEFT) != 0 or sx1 - lookahead < 0 or
+                (has_exclusion and sx2 > ex_x1 and sx1 - lookahead < ex_x2) or
+                _wall_changed(screen_pixels, sx1, sy1, sx2, sy2, WALL_LEFT, thickness, lookahead, sample_rate, average))
+        right = ((seed_locks & LOCK_RIGHT) != 0 or sx2 + lookahead >= screen_width or
+                 (has_exclusion and sx1 < ex_x2 and sx2 + lookahead > ex_x1) or
+                 _wall_changed(screen_pixels, sx1, sy1, sx2, sy2, WALL_RIGHT, thickness, lookahead, sample_rate, average))
+        
+        if top:
+            seed_locks |= LOCK_TOP
+        if bottom:
+            seed_locks |= LOCK_BOTTOM
+        if left:
+            seed_locks |= LOCK_LEFT
+        if right:
+            seed_locks |= LOCK_RIGHT
+        locks[i] = seed_locks
+        
+        if ((seed_locks & LOCK_HORIZONTAL) == LOCK_HORIZONTAL or (seed_locks & LOCK_VERTICAL) == LOCK_VERTICAL or
+                _LOCK_COUNT[seed_locks] >= 3):
+            growth_complete[i] = True
+
+
+@jit(nopython=True, parallel=True, cache=True)
+def grow_batch(x1, y1, x2, y2, locks, growth_complete, active, aspect_ratio, growth_pixels,
+               screen_width, screen_height, exclusion_zone):
+    """Grow every active seed that still has an open wall on both axes
+
+    exclusion_zone is (x1, y1, x2, y2), or empty when there is none.
+    """
+    has_exclusion = exclusion_zone.shape[0] == 4
+    
+    # Each seed only touches its own entries, so seeds grow independently
+    for k in prange(active.shape[0]):
+        i = active[k]
+        seed_locks = locks[i]
+        if (growth_complete[i] or (seed_locks & LOCK_HORIZONTAL) == LOCK_HORIZONTAL or
+                (seed_locks & LOCK_VERTICAL) == LOCK_VERTICAL):
+            continue
+        
+        sx1, sy1, sx2, sy2 = x1[i], y1[i], x2[i], y2[i]
+        lock_top = (seed_locks & LOCK_TOP) != 0
+        lock_bottom = (seed_locks & LOCK_BOTTOM) != 0
+        lock_left = (seed_locks & LOCK_LEFT) != 0
+        lock_right = (seed_locks & LOCK_RIGHT) != 0
+        
+        # An open wall moves by growth_pixels, or by twice that when the opposite wall is locked
+        if not lock_top and not lock_bottom:
+            sy1 -= growth_pixels
+            sy2 += growth_pixels
+        elif not lock_top:
+            sy1 -= growth_pixels * 2
+        elif not lock_bottom:
+            sy2 += growth_pixels * 2
+        
+        target_width = int((sy2 - sy1) * aspect_ratio)
+        width_diff = target_width - (sx2 - sx1)
+        
+        if not lock_left and not lock_right:
+            sx1 -= width_diff // 2
+            sx2 += width_diff - (width_diff // 2)
+        elif not lock_left:
+            sx1 -= width_diff
+        elif not lock_right:
+            sx2 += width_diff
+        
+        sx1 = max(0, sx1)
+        sy1 = max(0, sy1)
+        sx2 = min(screen_width, sx2)
+        sy2 = min(screen_height, sy2)
+        
+        # Clip to exclusion zone boundaries, pushing back any edge that crossed into it from outside
+        if has_exclusion:
+            ex_x1, ex_y1, ex_x2, ex_y2 = exclusion_zone[0], exclusion_zone[1], exclusion_zone[2], exclusion_zone[3]
+            if sx1 < ex_x1 and sx2 > ex_x1:
+                sx1 = ex_x1
+            if sx2 > ex_x2 and sx1 < ex_x2:
+                sx2 = ex_x2
+            if sy1 < ex_y1 and sy2 > ex_y1:
+                sy1 = ex_y1
+            if sy2 > ex_y2 and sy1 < ex_y2:
+                sy2 = ex_y2
+        
+        x1[i], y1[i], x2[i], y2[i] = sx1, sy1, sx2, sy2
 
 
 @dataclass
@@ -123,206 +232,39 @@ class Config:
     pixel_sample_rate: int = 1
 
 
-class Seed:
-    def __init__(self, center_x: int, center_y: int, config: Config, screen_pixels: np.ndarray, seed_id: int, compare_func, exclusion_zone=None):
-        initial_size = 5
-        self.x1 = center_x
-        self.y1 = center_y
-        self.x2 = center_x + int(initial_size * config.aspect_ratio)
-        self.y2 = center_y + initial_size
-        
-        self.config = config
-        self.screen_pixels = screen_pixels
-        self.seed_id = seed_id
-        self.growth_complete = False
-        self.compare_func = compare_func
-        
-        self.screen_height, self.screen_width = screen_pixels.shape[:2]
-        
-        self.lock_left = False
-        self.lock_right = False
-        self.lock_top = False
-        self.lock_bottom = False
-        
-        # Exclusion zone: (x1, y1, x2, y2) or None
-        self.exclusion_zone = exclusion_zone
-    
-    def get_coords(self):
-        return (self.x1, self.y1, self.x2, self.y2)
-    
-    def get_area(self):
-        return max(0, (self.x2 - self.x1) * (self.y2 - self.y1))
+@dataclass
+class SeedBatch:
+    """Rectangles and wall locks of all seeds, one array per field"""
+    x1: np.ndarray
+    y1: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+    locks: np.ndarray  # LOCK_* bits per seed
+    growth_complete: np.ndarray
     
-    def grow(self):
-        if self.growth_complete:
-            return
-        
-        growth_pixels = self.config.growth_pixels
-        
-        if self.lock_left and self.lock_right:
-            return
-        if self.lock_top and self.lock_bottom:
-            return
-        
-        if not self.lock_top and not self.lock_bottom:
-            self.y1 -= growth_pixels
-            self.y2 += growth_pixels
-        elif not self.lock_top:
-            self.y1 -= growth_pixels * 2
-        elif not self.lock_bottom:
-            self.y2 += growth_pixels * 2
-        
-        current_height = self.y2 - self.y1
-        target_width = int(current_height * self.config.aspect_ratio)
-        current_width = self.x2 - self.x1
-        width_diff = target_width - current_width
-        
-        if not self.lock_left and not self.lock_right:
-            self.x1 -= width_diff // 2
-            self.x2 += width_diff - (width_diff // 2)
-        elif not self.lock_left:
-            self.x1 -= width_diff
-        elif not self.lock_right:
-            self.x2 += width_diff
-        
-        self.x1 = max(0, self.x1)
-        self.y1 = max(0, self.y1)
-        self.x2 = min(self.screen_width, self.x2)
-        self.y2 = min(self.screen_height, self.y2)
-        
-        # Clip to exclusion zone boundaries
-        if self.exclusion_zone is not None:
-            ex_x1, ex_y1, ex_x2, ex_y2 = self.exclusion_zone
-            
-            # If left edge has crossed into zone from outside-left, push it back
-            if self.x1 < ex_x1 and self.x2 > ex_x1:
-                self.x1 = ex_x1
-            
-            # If right edge has crossed into zone from outside-right, push it back
-            if self.x2 > ex_x2 and self.x1 < ex_x2:
-                self.x2 = ex_x2
-            
-            # If top edge has crossed into zone from outside-top, push it back
-            if self.y1 < ex_y1 and self.y2 > ex_y1:
-                self.y1 = ex_y1
-            
-            # If bottom edge has crossed into zone from outside-bottom, push it back
-            if self.y2 > ex_y2 and self.y1 < ex_y2:
-                self.y2 = ex_y2
+    @classmethod
+    def from_centers(cls, center_x: np.ndarray, center_y: np.ndarray, config: Config):
+        initial_size = 5
+        count = len(center_x)
+        return cls(
+            x1=center_x.astype(np.int64),
+            y1=center_y.astype(np.int64),
+            x2=center_x + int(initial_size * config.aspect_ratio),
+            y2=center_y + initial_size,
+            locks=np.zeros(count, dtype=np.uint8),
+            growth_complete=np.zeros(count, dtype=bool)
+        )
     
-    def _get_wall_pixels(self, wall: str):
-        thickness = self.config.wall_thickness
-        
-        if wall == 'top':
-            return self.screen_pixels[self.y1:self.y1+thickness, self.x1:self.x2]
-        elif wall == 'bottom':
-            return self.screen_pixels[self.y2-thickness:self.y2, self.x1:self.x2]
-        elif wall == 'left':
-            return self.screen_pixels[self.y1:self.y2, self.x1:self.x1+thickness]
-        elif wall == 'right':
-            return self.screen_pixels[self.y1:self.y2, self.x2-thickness:self.x2]
-        return None
+    def get_coords(self, i):
+        return (int(self.x1[i]), int(self.y1[i]), int(self.x2[i]), int(self.y2[i]))
     
-    def _get_next_wall_pixels(self, wall: str, growth_pixels: int):
-        screen_height, screen_width = self.screen_pixels.shape[:2]
-        thickness = self.config.wall_thickness
-        
-        if wall == 'top':
-            next_y = max(0, self.y1 - growth_pixels)
-            if next_y == self.y1:
-                return None
-            return self.screen_pixels[next_y:next_y+thickness, self.x1:self.x2]
-        elif wall == 'bottom':
-            next_y = min(screen_height, self.y2 + growth_pixels)
-            if next_y == self.y2:
-                return None
-            return self.screen_pixels[next_y-thickness:next_y, self.x1:self.x2]
-        elif wall == 'left':
-            next_x = max(0, self.x1 - growth_pixels)
-            if next_x == self.x1:
-                return None
-            return self.screen_pixels[self.y1:self.y2, next_x:next_x+thickness]
-        elif wall == 'right':
-            next_x = min(screen_width, self.x2 + growth_pixels)
-            if next_x == self.x2:
-                return None
-            return self.screen_pixels[self.y1:self.y2, next_x-thickness:next_x]
-        return None
+    def get_areas(self):
+        return np.maximum(0, (self.x2 - self.x1) * (self.y2 - self.y1))
     
-    def check_and_lock_walls(self, sample_rate: int):
-        screen_height, screen_width = self.screen_pixels.shape[:2]
-        
-        walls_to_check = []
-        if not self.lock_top:
-            walls_to_check.append('top')
-        if not self.lock_bottom:
-            walls_to_check.append('bottom')
-        if not self.lock_left:
-            walls_to_check.append('left')
-        if not self.lock_right:
-            walls_to_check.append('right')
-        
-        for wall in walls_to_check:
-            should_lock = False
-            
-            if wall == 'top' and self.y1 - self.config.lookahead_pixels < 0:
-                should_lock = True
-            elif wall == 'bottom' and self.y2 + self.config.lookahead_pixels >= screen_height:
-                should_lock = True
-            elif wall == 'left' and self.x1 - self.config.lookahead_pixels < 0:
-                should_lock = True
-            elif wall == 'right' and self.x2 + self.config.lookahead_pixels >= screen_width:
-                should_lock = True
-            
-            # Check exclusion zone boundaries
-            if not should_lock and self.exclusion_zone is not None:
-                ex_x1, ex_y1, ex_x2, ex_y2 = self.exclusion_zone
-                
-                if wall == 'top':
-                    # Only lock if we're below the zone and moving toward it
-                    if self.y2 > ex_y1 and self.y1 - self.config.lookahead_pixels < ex_y2:
-                        should_lock = True
-                elif wall == 'bottom':
-                    # Only lock if we're above the zone and moving toward it
-                    if self.y1 < ex_y2 and self.y2 + self.config.lookahead_pixels > ex_y1:
-                        should_lock = True
-                elif wall == 'left':
-                    # Only lock if we're to the right of the zone and moving toward it
-                    if self.x2 > ex_x1 and self.x1 - self.config.lookahead_pixels < ex_x2:
-                        should_lock = True
-                elif wall == 'right':
-                    # Only lock if we're to the left of the zone and moving toward it
-                    if self.x1 < ex_x2 and self.x2 + self.config.lookahead_pixels > ex_x1:
-                        should_lock = True
-            
-            if not should_lock:
-                current_pixels = self._get_wall_pixels(wall)
-                next_pixels = self._get_next_wall_pixels(wall, self.config.lookahead_pixels)
-                
-                if next_pixels is None or current_pixels is None:
-                    continue
-                
-                color_changed = False
-                
-                color_changed = self.compare_func(wall, current_pixels, next_pixels, sample_rate)
-                
-                if color_changed:
-                    should_lock = True
-            
-            if should_lock:
-                if wall == 'top':
-                    self.lock_top = True
-                elif wall == 'bottom':
-                    self.lock_bottom = True
-                elif wall == 'left':
-                    self.lock_left = True
-                elif wall == 'right':
-                    self.lock_right = True
-        
-        if (self.lock_left and self.lock_right) or (self.lock_top and self.lock_bottom):
-            self.growth_complete = True
-        elif sum([self.lock_left, self.lock_right, self.lock_top, self.lock_bottom]) >= 3:
-            self.growth_complete = True
+    def grow(self, active, config: Config, screen_width: int, screen_height: int, exclusion):
+        """Grow every active seed that can still grow, all at once"""
+        grow_batch(self.x1, self.y1, self.x2, self.y2, self.locks, self.growth_complete, np.flatnonzero(active),
+                   config.aspect_ratio, config.growth_pixels, screen_width, screen_height, exclusion)
 
 
 def grow_seeds(num_seeds: int, num_keep: int, screen_pixels: np.ndarray, 
@@ -330,20 +272,14 @@ def grow_seeds(num_seeds: int, num_keep: int, screen_pixels: np.ndarray,
                color_mode: str = 'corners', jitter: int = 0,
                growth_pixels: int = 1, pixel_sample_rate: int = 1,
                no_overlap: bool = False, exclusion_zone: tuple = None):
-    
+    """Return the num_keep largest calm rectangles as ((x1, y1, x2, y2), area)
+
+    Channels are compared independently, so screen_pixels may be in BGR or RGB order.
+    """
+    # Worker threads read walls straight out of one C-contiguous frame
+    screen_pixels = np.ascontiguousarray(screen_pixels)
     screen_height, screen_width = screen_pixels.shape[:2]
     
-    # Create comparison function based on color mode
-    if color_mode == 'average':
-        def compare_func(wall, current_pixels, next_pixels, sample_rate):
-            return compare_avg_color_numba(current_pixels, next_pixels, sample_rate)
-    else:
-        def compare_func(wall, current_pixels, next_pixels, sample_rate):
-            if wall == 'top' or wall == 'bottom':
-                return compare_corner_horizontal_numba(current_pixels, next_pixels, sample_rate)
-            else:
-                return compare_corner_vertical_numba(current_pixels, next_pixels, sample_rate)
-    
     config = Config(
         lookahead_pixels=lookahead_pixels,
         wall_thickness=wall_thickness,
@@ -359,60 +295,51 @@ def grow_seeds(num_seeds: int, num_keep: int, screen_pixels: np.ndarray,
     col_spacing = screen_width / (grid_cols + 1)
     row_spacing = screen_height / (grid_rows + 1)
     
-    seeds = []
-    seed_idx = 0
-    for row in range(grid_rows):
-        for col in range(grid_cols):
-            if seed_idx >= num_seeds:
-                break
-            
-            center_x = int((col + 1) * col_spacing)
-            center_y = int((row + 1) * row_spacing)
-            
-            if jitter > 0:
-                import random
-                center_x += random.randint(-jitter, jitter)
-                center_y += random.randint(-jitter, jitter)
-                center_x = max(0, min(screen_width, center_x))
-                center_y = max(0, min(screen_height, center_y))
-            
-            seed = Seed(center_x, center_y, config, screen_pixels, seed_idx, compare_func, exclusion_zone=exclusion_zone)
-            seeds.append(seed)
-            seed_idx += 1
+    # Seeds sit on a grid in row-major order, trimmed to num_seeds
+    grid_x, grid_y = np.meshgrid((np.arange(1, grid_cols + 1) * col_spacing).astype(np.int64),
+                                 (np.arange(1, grid_rows + 1) * row_spacing).astype(np.int64))
+    centers_x = grid_x.ravel()[:num_seeds]
+    centers_y = grid_y.ravel()[:num_seeds]
+    
+    if jitter > 0:
+        centers_x = np.clip(centers_x + np.random.randint(-jitter, jitter + 1, size=centers_x.shape), 0, screen_width)
+        centers_y = np.clip(centers_y + np.random.randint(-jitter, jitter + 1, size=centers_y.shape), 0, screen_height)
     
-    active_seeds = seeds[:]
+    seeds = SeedBatch.from_centers(centers_x, centers_y, config)
+    active = np.ones(len(centers_x), dtype=bool)
     
-    while active_seeds:
-        for seed in active_seeds:
-            seed.check_and_lock_walls(pixel_sample_rate)
+    exclusion = np.array(exclusion_zone if exclusion_zone is not None else (), dtype=np.int64)
+    
+    while active.any():
+        check_walls_batch(screen_pixels, seeds.x1, seeds.y1, seeds.x2, seeds.y2, seeds.locks,
+                          seeds.growth_complete, np.flatnonzero(active), wall_thickness, lookahead_pixels,
+                          pixel_sample_rate, color_mode == 'average', exclusion)
         
-        for seed in active_seeds:
-            seed.grow()
+        seeds.grow(active, config, screen_width, screen_height, exclusion)
         
-        active_seeds = [s for s in active_seeds if not s.growth_complete]
-
-    sorted_seeds = sorted(enumerate(seeds), key=lambda x: x[1].get_area(), reverse=True)
+        active &= ~seeds.growth_complete
+    
+    # Stable sort keeps seed order among equal areas
+    areas = seeds.get_areas()
+    sorted_seeds = np.argsort(-areas, kind='stable')
     
     if no_overlap:
-        def rectangles_overlap(rect1, rect2):
-            x1_a, y1_a, x2_a, y2_a = rect1
-            x1_b, y1_b, x2_b, y2_b = rect2
-            return not (x2_a < x1_b or x2_b < x1_a or y2_a < y1_b or y2_b < y1_a)
+        # Pairwise overlap of all seeds; rectangles that only touch at an edge count as overlapping
+        x1, y1, x2, y2 = seeds.x1, seeds.y1, seeds.x2, seeds.y2
+        overlaps = ((x2[:, None] >= x1[None, :]) & (x2[None, :] >= x1[:, None]) &
+                    (y2[:, None] >= y1[None, :]) & (y2[None, :] >= y1[:, None]))
         
         top_seeds = []
-        for original_idx, seed in sorted_seeds:
-            seed_rect = seed.get_coords()
-            overlaps = False
-            for _, selected_seed in top_seeds:
-                if rectangles_overlap(seed_rect, selected_seed.get_coords()):
-                    overlaps = True
-                    break
+        blocked = np.zeros(len(areas), dtype=bool)
+        for i in sorted_seeds:
+            if blocked[i]:
+                continue
             
-            if not overlaps:
-                top_seeds.append((original_idx, seed))
-                if len(top_seeds) >= num_keep:
-                    break
+            top_seeds.append(i)
+            if len(top_seeds) >= num_keep:
+                break
+            blocked |= overlaps[i]
     else:
         top_seeds = sorted_seeds[:num_keep]
     
-    return [(seed.get_coords(), seed.get_area()) for _, seed in top_seeds]
+    return [(seeds.get_coords(i), int(areas[i])) for i in top_seeds]
@@ -0,0 +1,42 @@
+import os
+import sys
+import types
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# bettercam is Windows-only and only used once monitoring starts, so an empty module lets the browser import anywhere
+try:
+    import bettercam
+except ImportError:
+    sys.modules["bettercam"] = types.ModuleType("bettercam")
+
+import pip_video_browser
+
+
+class SearchUrlTest(unittest.TestCase):
+    def assert_query_round_trips(self, text):
+        encoded = bytes(pip_video_browser._search_url(text).toEncoded()).decode("ascii")
+        parts = urlsplit(encoded)
+        self.assertEqual(parts.netloc, "www.google.com")
+        self.assertEqual(parts.path, "/search")
+        self.assertEqual(parts.fragment, "")
+        # parse_qs decodes '+' as a space, the same way Google does
+        self.assertEqual(parse_qs(parts.query), {"q": [text]})
+
+    def test_plus(self):
+        self.assert_query_round_trips("c++ tutorial")
+
+    def test_ampersand_and_equals(self):
+        self.assert_query_round_trips("salt & pepper=taste")
+
+    def test_hash_and_percent(self):
+        self.assert_query_round_trips("#1 song 100%")
+
+    def test_non_ascii(self):
+        self.assert_query_round_trips("naïve café 日本語")
+
+
+if __name__ == '__main__':
+    unittest.main()